@@ -1,19 +1,32 @@
 # app.py
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
+from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, g, abort, has_request_context
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.orm import joinedload, raiseload
 from flask_mail import Mail, Message
+from flask_caching import Cache
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
-import threading, time, os
+from collections import defaultdict
+from functools import wraps
+import threading, os
 from dotenv import load_dotenv
 
 load_dotenv()
 app = Flask(__name__)
 app.secret_key = os.getenv("SECRET_KEY", "secret123")
+# Werkzeug hash spec, e.g. "scrypt:16384:8:1"; existing hashes keep verifying with their own params
+app.config['PASSWORD_HASH_METHOD'] = os.getenv("PASSWORD_HASH_METHOD", "scrypt")
 
 # DB
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///tasks.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# keep enough pooled connections for the threaded server so each one's page cache stays warm
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {"pool_size": 10, "max_overflow": 10, "query_cache_size": 1200}
+# dev guard: make unplanned lazy loads raise instead of silently issuing N+1 queries
+app.config['DEBUG_RAISELOAD'] = os.getenv('DEBUG_RAISELOAD') == '1'
+# dev aid: count SQL statements per request and report them in X-Query-Count
+app.config['DEBUG_QUERY_COUNT'] = os.getenv('DEBUG_QUERY_COUNT') == '1'
 db = SQLAlchemy(app)
 
 # Mail (optional)
@@ -24,21 +37,40 @@ app.config['MAIL_USERNAME'] = os.getenv('MAIL_USERNAME')
 app.config['MAIL_PASSWORD'] = os.getenv('MAIL_PASSWORD')
 mail = Mail(app)
 
+# Page cache (use RedisCache + CACHE_REDIS_URL when running several workers)
+app.config['CACHE_TYPE'] = os.getenv('CACHE_TYPE', 'SimpleCache')
+app.config['CACHE_REDIS_URL'] = os.getenv('CACHE_REDIS_URL')
+app.config['CACHE_DEFAULT_TIMEOUT'] = 300
+cache = Cache(app)
+
 # ---------- MODELS ----------
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(50))
-    email = db.Column(db.String(100), unique=True)
+    email = db.Column(db.String(100))
     password = db.Column(db.String(200))
-    columns = db.relationship('Column', backref='user', lazy=True)
-    tasks = db.relationship('Task', backref='user', lazy=True)
+    columns = db.relationship('Column', back_populates='user', lazy='select')
+    tasks = db.relationship('Task', back_populates='user', lazy='dynamic')
+
+    __table_args__ = (
+        db.Index('ix_user_email', 'email', unique=True),
+    )
 
 class Column(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(50), nullable=False)
     position = db.Column(db.Integer, default=0)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
-    tasks = db.relationship('Task', backref='column', lazy=True)
+    user = db.relationship('User', back_populates='columns', lazy='select')
+    # same order as the board: by due date, tasks without one last
+    tasks = db.relationship(
+        'Task', back_populates='column', lazy='select',
+        order_by=lambda: (Task.due_date.is_(None), Task.due_date)
+    )
+
+    __table_args__ = (
+        db.Index('ix_column_user_pos', 'user_id', 'position'),
+    )
 
 class Task(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -52,11 +84,45 @@ class Task(db.Model):
     status = db.Column(db.String(20), default="todo")
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     column_id = db.Column(db.Integer, db.ForeignKey('column.id'), nullable=True)
+    # many-to-one 'select' loads hit the identity map first, so t.user after current_user() is free
+    user = db.relationship('User', back_populates='tasks', lazy='select')
+    column = db.relationship('Column', back_populates='tasks', lazy='select')
+
+    __table_args__ = (
+        db.Index('ix_task_user_complete', 'user_id', 'complete'),
+        db.Index('ix_task_user_due', 'user_id', 'due_date'),
+        db.Index('ix_task_user_column', 'user_id', 'column_id'),
+    )
+
+# built once so the compiled SQL for the priority sort is reused across requests
+PRIORITY_ORDER = db.case(
+    (Task.priority == 'High', 0),
+    (Task.priority == 'Medium', 1),
+    (Task.priority == 'Low', 2),
+    else_=3
+)
+
+def _set_sqlite_pragmas(dbapi_conn, _record):
+    # WAL lets readers run alongside a writer and fsyncs far less than the default journal
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")
+    cur.execute("PRAGMA cache_size=-20000")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    cur.execute("PRAGMA mmap_size=134217728")
+    cur.close()
 
 with app.app_context():
+    event.listen(db.engine, "connect", _set_sqlite_pragmas)
     db.create_all()
+    # create_all() skips tables that already exist, so add any new indexes to older DBs
+    for model in (Column, Task):
+        for index in model.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
 
 # ---------- Helpers ----------
+SQLITE_MAX_INT = 2**63 - 1
+
 def ensure_default_columns(user_id):
     """Create default workflow columns for a user if none exist."""
     cols = Column.query.filter_by(user_id=user_id).order_by(Column.position).all()
@@ -67,16 +133,83 @@ def ensure_default_columns(user_id):
             db.session.add(c)
         db.session.commit()
 
-def calculate_stats(tasks):
+def calculate_stats(tasks, now=None):
+    now = now or datetime.now()
+    total = pending = completed = overdue = 0
+    for t in tasks:
+        total += 1
+        if t.complete:
+            completed += 1
+        else:
+            pending += 1
+            if t.due_date and t.due_date < now:
+                overdue += 1
+    return {
+        "total": total,
+        "pending": pending,
+        "completed": completed,
+        "overdue": overdue
+    }
+
+def stats_for_user(user_id, now=None):
+    """Task stats for a user, aggregated in SQL instead of loading every row."""
+    now = now or datetime.now()
+    total, pending, completed, overdue = db.session.query(
+        db.func.count(Task.id),
+        db.func.coalesce(db.func.sum(db.case((~Task.complete, 1), else_=0)), 0),
+        db.func.coalesce(db.func.sum(db.case((Task.complete, 1), else_=0)), 0),
+        db.func.coalesce(db.func.sum(db.case(((Task.due_date < now) & ~Task.complete, 1), else_=0)), 0)
+    ).filter(Task.user_id == user_id).one()
     return {
-        "total": len(tasks),
-        "pending": len([t for t in tasks if not t.complete]),
-        "completed": len([t for t in tasks if t.complete]),
-        "overdue": len([t for t in tasks if t.due_date and t.due_date < datetime.now() and not t.complete])
+        "total": total,
+        "pending": pending,
+        "completed": completed,
+        "overdue": overdue
     }
 
+def current_user():
+    """Logged-in user, loaded once per request."""
+    if 'user' not in g:
+        g.user = db.session.get(User, session['user_id'])
+    return g.user
+
+CACHED_PAGES = ('index', 'completed', 'pending')
+# Writes invalidate these pages, but stats.overdue also changes as time passes with no
+# write; a short timeout bounds how long a newly overdue task can still show as on time.
+PAGE_CACHE_TIMEOUT = 60
+
+def page_cache_key(endpoint=None, user_id=None, dark_mode=None):
+    endpoint = endpoint or request.endpoint
+    user_id = user_id if user_id is not None else session['user_id']
+    dark_mode = dark_mode if dark_mode is not None else session.get('dark_mode', False)
+    return f"page:{endpoint}:{user_id}:{int(dark_mode)}"
+
+def has_pending_flashes():
+    # flashed messages are rendered into the page, so never cache or serve those
+    return bool(session.get('_flashes'))
+
+def invalidate_pages(user_id):
+    """Drop a user's cached pages after their tasks change."""
+    cache.delete_many(*[
+        page_cache_key(endpoint, user_id, dark_mode)
+        for endpoint in CACHED_PAGES
+        for dark_mode in (False, True)
+    ])
+
+def strict_loading():
+    """Extra query options that forbid lazy loads when DEBUG_RAISELOAD is on."""
+    return (raiseload('*'),) if app.config['DEBUG_RAISELOAD'] else ()
+
+def parse_due_date(value):
+    """Parse a datetime-local/date form value; None if empty or invalid."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
 def login_required(f):
-    from functools import wraps
     @wraps(f)
     def wrapper(*args, **kwargs):
         if 'user_id' not in session:
@@ -86,83 +219,121 @@ def login_required(f):
     return wrapper
 
 # ---------- Reminder worker ----------
+# The worker runs in the `python app.py` process only (gunicorn never starts it), and
+# add/toggle/toggle_reminder/edit_task set reminder_wakeup, so every change it needs to
+# see is signalled in-process. Writes from another process (a second server, a shell)
+# are only picked up at the next wake, so they can miss a window within REMINDER_MAX_SLEEP.
+REMINDER_WINDOW = 300  # seconds before due_date
+REMINDER_MAX_SLEEP = 3600
+reminder_wakeup = threading.Event()
+
 def reminder_worker():
     while True:
+        # clear before reading so a change made mid-pass still wakes the next wait
+        reminder_wakeup.clear()
+        next_check = REMINDER_MAX_SLEEP
         with app.app_context():
             now = datetime.now()
-            tasks = Task.query.filter_by(reminder_set=True, complete=False).all()
+            tasks = (
+                Task.query.options(joinedload(Task.user), *strict_loading())
+                .filter_by(reminder_set=True, complete=False)
+                .filter(Task.due_date > now)
+                .all()
+            )
+            dirty = []
             for t in tasks:
-                if t.due_date:
-                    seconds_left = (t.due_date - now).total_seconds()
-                    # send reminder if due within next 5 minutes
-                    if 0 < seconds_left < 300:
-                        try:
-                            if app.config.get('MAIL_USERNAME') and app.config.get('MAIL_PASSWORD'):
-                                msg = Message(
-                                    subject="Task Reminder",
-                                    sender=app.config['MAIL_USERNAME'],
-                                    recipients=[t.user.email],
-                                    body=f"Reminder: {t.title}\nDue at {t.due_date.strftime('%Y-%m-%d %H:%M')}\n\n{t.description or ''}"
-                                )
-                                mail.send(msg)
-                        except Exception as e:
-                            print("Reminder send error:", e)
-                        t.reminder_set = False
-                        db.session.commit()
-        time.sleep(60)
+                seconds_left = (t.due_date - now).total_seconds()
+                # send reminder if due within next 5 minutes
+                if seconds_left < REMINDER_WINDOW:
+                    try:
+                        if app.config.get('MAIL_USERNAME') and app.config.get('MAIL_PASSWORD'):
+                            msg = Message(
+                                subject="Task Reminder",
+                                sender=app.config['MAIL_USERNAME'],
+                                recipients=[t.user.email],
+                                body=f"Reminder: {t.title}\nDue at {t.due_date.strftime('%Y-%m-%d %H:%M')}\n\n{t.description or ''}"
+                            )
+                            mail.send(msg)
+                    except Exception as e:
+                        print("Reminder send error:", e)
+                    t.reminder_set = False
+                    dirty.append(t)
+                else:
+                    # sleep until this task enters the reminder window
+                    next_check = min(next_check, seconds_left - REMINDER_WINDOW + 1)
+            # one commit for the whole batch instead of one per reminder
+            if dirty:
+                db.session.commit()
+        # routes that change reminders set the event so we re-plan immediately
+        reminder_wakeup.wait(next_check)
+
+# ---------- Query counting (DEBUG_QUERY_COUNT) ----------
+def _count_query(*_args):
+    if has_request_context() and 'query_count' in g:
+        g.query_count += 1
+
+if app.config['DEBUG_QUERY_COUNT']:
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", _count_query)
+
+    @app.before_request
+    def start_query_count():
+        g.query_count = 0
+
+    @app.after_request
+    def report_query_count(response):
+        if 'query_count' in g:
+            response.headers['X-Query-Count'] = str(g.query_count)
+            app.logger.info("%s %s: %d queries", request.method, request.path, g.query_count)
+        return response
 
 # ---------- ROUTES ----------
 @app.route('/')
 @login_required
+@cache.cached(timeout=PAGE_CACHE_TIMEOUT, make_cache_key=page_cache_key, unless=has_pending_flashes)
 def index():
-    user = User.query.get(session['user_id'])
-    tasks = Task.query.filter_by(user_id=user.id).order_by(Task.due_date).all()
-    stats = calculate_stats(tasks)
+    user = current_user()
+    now = datetime.now()
+    tasks = Task.query.options(*strict_loading()).filter_by(user_id=user.id).order_by(Task.due_date).all()
+    stats = calculate_stats(tasks, now)
     return render_template('index.html', user=user, tasks=tasks, stats=stats, dark_mode=session.get('dark_mode', False))
 
 @app.route('/workflow')  # renamed page
 @login_required
 def workflow():
-    user = User.query.get(session['user_id'])
-    ensure_default_columns(user.id)
+    user = current_user()
+    now = datetime.now()
     sort_by = request.args.get('sort', 'due_date')
-    tasks_query = Task.query.filter_by(user_id=user.id)
+    tasks_query = Task.query.options(*strict_loading()).filter_by(user_id=user.id)
     
     if sort_by == 'priority':
-        tasks_query = tasks_query.order_by(
-            db.case(
-                (Task.priority == 'High', 0),
-                (Task.priority == 'Medium', 1),
-                (Task.priority == 'Low', 2),
-                else_=3
-            )
-        )
+        tasks_query = tasks_query.order_by(PRIORITY_ORDER)
     elif sort_by == 'created_at':
         tasks_query = tasks_query.order_by(Task.created_at.desc())
     else:
-        tasks_query = tasks_query.order_by(Task.due_date.asc())
+        # tasks with no due_date go to the bottom
+        tasks_query = tasks_query.order_by(Task.due_date.is_(None), Task.due_date.asc())
 
     tasks = tasks_query.all()
-    columns = Column.query.filter_by(user_id=user.id).order_by(Column.position).all()
-    default_names = ['To Do', 'In Progress', 'Completed', 'Pending', 'Done']
-    existing_names = [col.name for col in columns]
-
-    for name in default_names:
-        if name not in existing_names:
-            new_col = Column(name=name, user_id=user.id)
-            db.session.add(new_col)
+    columns = (
+        Column.query.filter_by(user_id=user.id)
+        .order_by(Column.position)
+        .options(*strict_loading())
+        .all()
+    )
 
-    
-    # Safe sorting: put tasks with no due_date at the bottom
-    for col in columns:
-        col.tasks = sorted(col.tasks, key=lambda t: t.due_date if t.due_date else datetime.max)
+    # buckets keep the query's ordering
+    tasks_by_col = defaultdict(list)
+    for t in tasks:
+        tasks_by_col[t.column_id].append(t)
 
-    stats = calculate_stats(tasks)
+    stats = calculate_stats(tasks, now)
     return render_template(
         'workflow.html',
         user=user,
         tasks=tasks,
         columns=columns,
+        tasks_by_col=tasks_by_col,
         stats=stats,
         datetime=datetime,
         sort_by=sort_by,
@@ -171,18 +342,22 @@ def workflow():
 
 @app.route('/completed')
 @login_required
+@cache.cached(timeout=PAGE_CACHE_TIMEOUT, make_cache_key=page_cache_key, unless=has_pending_flashes)
 def completed():
-    user = User.query.get(session['user_id'])
-    tasks = Task.query.filter_by(user_id=user.id, complete=True).order_by(Task.due_date).all()
-    stats = calculate_stats(Task.query.filter_by(user_id=user.id).all())
+    user = current_user()
+    now = datetime.now()
+    tasks = Task.query.options(*strict_loading()).filter_by(user_id=user.id, complete=True).order_by(Task.due_date).all()
+    stats = stats_for_user(user.id, now)
     return render_template('completed.html', user=user, tasks=tasks, stats=stats, dark_mode=session.get('dark_mode', False))
 
 @app.route('/pending')
 @login_required
+@cache.cached(timeout=PAGE_CACHE_TIMEOUT, make_cache_key=page_cache_key, unless=has_pending_flashes)
 def pending():
-    user = User.query.get(session['user_id'])
-    tasks = Task.query.filter_by(user_id=user.id, complete=False).order_by(Task.due_date).all()
-    stats = calculate_stats(Task.query.filter_by(user_id=user.id).all())
+    user = current_user()
+    now = datetime.now()
+    tasks = Task.query.options(*strict_loading()).filter_by(user_id=user.id, complete=False).order_by(Task.due_date).all()
+    stats = stats_for_user(user.id, now)
     return render_template('pending.html', user=user, tasks=tasks, stats=stats, dark_mode=session.get('dark_mode', False))
 
 @app.route("/add", methods=["POST"])
@@ -200,27 +375,22 @@ def add():
         return redirect(request.referrer or url_for('index'))
 
     # parse datetime safely
-    due_date = None
-    if due:
-        try:
-            due_date = datetime.strptime(due, "%Y-%m-%dT%H:%M")
-        except Exception:
-            due_date = None
+    due_date = parse_due_date(due)
 
     user_id = session['user_id']
-    # if column provided use it, else put in first column (create defaults if necessary)
-    ensure_default_columns(user_id)
-    if column_id:
-        try:
-            column_id = int(column_id)
-            col = Column.query.filter_by(id=column_id, user_id=user_id).first()
-            if not col:
-                column_id = Column.query.filter_by(user_id=user_id).order_by(Column.position).first().id
-        except Exception:
-            column_id = Column.query.filter_by(user_id=user_id).order_by(Column.position).first().id
-    else:
-        first_col = Column.query.filter_by(user_id=user_id).order_by(Column.position).first()
-        column_id = first_col.id if first_col else None
+    # if column provided use it, else put in first column
+    try:
+        column_id = int(column_id) if column_id else None
+    except ValueError:
+        column_id = None
+    # out-of-range ids can't exist and would overflow SQLite's INTEGER binding
+    if column_id is not None and not 1 <= column_id <= SQLITE_MAX_INT:
+        column_id = None
+    user_columns = db.session.query(Column.id).filter_by(user_id=user_id)
+    if column_id is not None:
+        column_id = user_columns.filter_by(id=column_id).scalar()
+    if column_id is None:
+        column_id = user_columns.order_by(Column.position).limit(1).scalar()
 
     task = Task(
         title=title,
@@ -234,6 +404,9 @@ def add():
     )
     db.session.add(task)
     db.session.commit()
+    invalidate_pages(user_id)
+    if task.reminder_set:
+        reminder_wakeup.set()
     flash("Task added.", "success")
     return redirect(request.referrer or url_for('index'))
 
@@ -255,61 +428,73 @@ def add_column():
 @app.route("/update_column/<int:task_id>/<int:col_id>", methods=["POST"])
 @login_required
 def update_column(task_id, col_id):
-    task = Task.query.get_or_404(task_id)
-    if task.user_id != session.get('user_id'):
-        return jsonify({"success": False, "error": "Unauthorized"}), 403
-    col = Column.query.filter_by(id=col_id, user_id=session['user_id']).first()
-    if not col:
+    user_id = session['user_id']
+    col_name = db.session.query(Column.name).filter_by(id=col_id, user_id=user_id).scalar()
+    if col_name is None:
         return jsonify({"success": False, "error": "Column not found"}), 404
-    task.column_id = col_id
     # optional: set status based on column name
-    task.status = col.name.lower()
+    updated = Task.query.filter_by(id=task_id, user_id=user_id).update(
+        {Task.column_id: col_id, Task.status: col_name.lower()}, synchronize_session=False
+    )
+    if not updated:
+        return jsonify({"success": False, "error": "Task not found"}), 404
     db.session.commit()
+    invalidate_pages(user_id)
     return jsonify({"success": True})
 
 @app.route("/update_status/<int:task_id>/<string:new_status>", methods=["POST"])
 @login_required
 def update_status(task_id, new_status):
-    task = Task.query.get_or_404(task_id)
-    if task.user_id != session.get('user_id'):
-        return jsonify({"success": False, "error": "Unauthorized"}), 403
-    task.status = new_status
+    user_id = session['user_id']
+    updated = Task.query.filter_by(id=task_id, user_id=user_id).update(
+        {Task.status: new_status}, synchronize_session=False
+    )
+    if not updated:
+        return jsonify({"success": False, "error": "Task not found"}), 404
     db.session.commit()
+    invalidate_pages(user_id)
     return jsonify({"success": True})
 
 @app.route("/toggle_reminder/<int:id>")
 @login_required
 def toggle_reminder(id):
-    t = Task.query.get_or_404(id)
-    if t.user_id != session.get('user_id'):
-        flash("Not authorized", "danger")
-        return redirect(request.referrer or url_for('index'))
-    t.reminder_set = not t.reminder_set
+    user_id = session['user_id']
+    updated = Task.query.filter_by(id=id, user_id=user_id).update(
+        {Task.reminder_set: ~Task.reminder_set}, synchronize_session=False
+    )
+    if not updated:
+        abort(404)
     db.session.commit()
+    invalidate_pages(user_id)
+    reminder_wakeup.set()
     flash("Reminder toggled.", "info")
     return redirect(request.referrer or url_for('index'))
 
 @app.route('/toggle/<int:id>')
 @login_required
 def toggle(id):
-    t = Task.query.get_or_404(id)
-    if t.user_id != session.get('user_id'):
-        flash("Not authorized.", "danger")
-        return redirect(url_for('index'))
-    t.complete = not t.complete
+    user_id = session['user_id']
+    updated = Task.query.filter_by(id=id, user_id=user_id).update(
+        {Task.complete: ~Task.complete}, synchronize_session=False
+    )
+    if not updated:
+        abort(404)
     db.session.commit()
+    invalidate_pages(user_id)
+    # un-completing a task can bring its reminder back into play
+    reminder_wakeup.set()
     flash("Task updated.", "success")
     return redirect(request.referrer or url_for('index'))
 
 @app.route('/delete/<int:id>')
 @login_required
 def delete(id):
-    t = Task.query.get_or_404(id)
-    if t.user_id != session.get('user_id'):
-        flash("Not authorized.", "danger")
-        return redirect(url_for('index'))
-    db.session.delete(t)
+    user_id = session['user_id']
+    deleted = Task.query.filter_by(id=id, user_id=user_id).delete(synchronize_session=False)
+    if not deleted:
+        abort(404)
     db.session.commit()
+    invalidate_pages(user_id)
     flash("Task deleted.", "info")
     return redirect(request.referrer or url_for('index'))
 
@@ -323,10 +508,10 @@ def signup():
         if not name or not email or not password:
             flash("Please fill all fields.", "danger")
             return render_template('signup.html')
-        if User.query.filter_by(email=email).first():
+        if db.session.query(User.query.filter_by(email=email).exists()).scalar():
             flash("Email already registered.", "warning")
             return render_template('signup.html')
-        hashed = generate_password_hash(password)
+        hashed = generate_password_hash(password, method=app.config['PASSWORD_HASH_METHOD'])
         user = User(name=name, email=email, password=hashed)
         db.session.add(user)
         db.session.commit()
@@ -383,21 +568,34 @@ def delete_column(column_id):
 @app.route('/edit_task/<int:task_id>', methods=['POST'])
 @login_required
 def edit_task(task_id):
-    task = Task.query.get(task_id)
+    task = Task.query.filter_by(id=task_id, user_id=session['user_id']).first()
     if not task:
         flash("Task not found!", "danger")
         return redirect(url_for('workflow'))
     
     task.title = request.form['title']
     task.description = request.form['description']
-    task.due_date = request.form['due_date'] or None
+    task.due_date = parse_due_date(request.form.get('due_date'))
     task.priority = request.form['priority']
     db.session.commit()
+    invalidate_pages(task.user_id)
+    if task.reminder_set:
+        reminder_wakeup.set()
     
     flash("Task updated!", "success")
     return redirect(url_for('workflow'))
 
 
+# ---------- CLI ----------
+@app.cli.command("backfill-columns")
+def backfill_columns():
+    """One-off: give default columns to users created before signup made them."""
+    user_ids = [user_id for (user_id,) in db.session.query(User.id).filter(~User.columns.any())]
+    for user_id in user_ids:
+        ensure_default_columns(user_id)
+    print(f"Backfilled default columns for {len(user_ids)} user(s).")
+
+
 # ---------- Start reminder thread and app ----------
 if __name__ == "__main__":
     if os.environ.get("WERKZEUG_RUN_MAIN") == "true" or not app.debug: